@@ -1,10 +1,56 @@
 import os
 
+import io
 import sys
+import stat as stat_module
+import socket
 import hashlib
 import json
+import contextlib
+import mmap
 import shutil
 import datetime
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Optional binary serialization. cbor2 is preferred because its
+# canonical mode (RFC 8949 deterministic encoding) sorts keys in C and
+# yields bytes directly suitable for hashing; msgpack is the next
+# choice. JSON stays as the fallback, and records written by older
+# versions remain readable.
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Optional Rust/SIMD JSON codec for the JSON path; emits bytes directly
+# and is typically 3-10x faster than the stdlib json module.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional BLAKE3 content hash: SIMD-parallel and tree-structured, so a
+# single file hashes across cores at several GB/s. SHA-1 remains the
+# fallback. A repo is self-consistent with whichever hash wrote it, but
+# switching an existing repo requires a one-time rehash.
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# Optional filesystem watcher (Linux) backing the `watch` command; lets
+# status consult a change journal instead of walking the whole tree.
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
 
 #------python code-----
 # ----------- Utility functions ------------
@@ -14,24 +60,205 @@ def repo_path(*paths):
     """Return path inside .myvcs folder"""
     return os.path.join(".myvcs", *paths)
 
+# Chunk size for streaming I/O. Sequential reads/writes this size keep
+# syscall count low and feed the hash/copy engines full buffers.
+BUF = 1 << 20
+
+# Files at least this big are hashed via mmap in a single update() call.
+_MMAP_THRESHOLD = 1 << 20
+
+def _new_hash():
+    """New content-hash object: BLAKE3 when installed, else SHA-1 via
+    OpenSSL (usedforsecurity=False picks its fastest backend, SHA-NI /
+    ARMv8-CE accelerated where available)."""
+    if blake3 is not None:
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+    return hashlib.new("sha1", usedforsecurity=False)
+
 def file_sha1(path):
-    """Calculate SHA-1 hash of file content"""
-    h = hashlib.sha1()
-    with open(path, "rb") as f:
+    """Calculate the content hash of a file"""
+    if blake3 is not None:
+        # update_mmap memory-maps and hashes the file multi-threaded.
+        h = _new_hash()
+        h.update_mmap(path)
+        return h.hexdigest()
+    with open(path, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= _MMAP_THRESHOLD:
+            # Hash the whole mapping in one GIL-released call.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h = _new_hash()
+                h.update(mm)
+                return h.hexdigest()
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, _new_hash).hexdigest()
+        # Fallback: stream into a reusable buffer to avoid
+        # allocating a fresh bytes object per chunk.
+        h = _new_hash()
+        buf = bytearray(BUF)
+        view = memoryview(buf)
         while True:
-            chunk = f.read(65536)
-            if not chunk:
+            n = f.readinto(buf)
+            if not n:
                 break
-            h.update(chunk)
+            h.update(view[:n])
+        return h.hexdigest()
+
+def fast_copy(src, dst):
+    """Copy src to dst without a userspace read/write loop.
+
+    Uses os.copy_file_range where available (in-kernel copy; on CoW
+    filesystems like btrfs/XFS this reflinks and is nearly free),
+    falling back to shutil.copyfile elsewhere."""
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb", buffering=0) as fsrc, \
+                 open(dst, "wb", buffering=0) as fdst:
+                while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30):
+                    pass
+            return
+        except OSError:
+            pass  # unsupported filesystem or kernel; fall through
+    with open(src, "rb", buffering=0) as fsrc, \
+         open(dst, "wb", buffering=0) as fdst:
+        shutil.copyfileobj(fsrc, fdst, BUF)
+
+def hash_and_store(path, objects_path, pack=None):
+    """Hash a file while streaming it into the object store, one pass.
+
+    Hashing and copying separately reads the file twice; here each 1 MiB
+    chunk feeds both the digest and a tempfile in objects/. Once the
+    hash is known the temp copy is appended to the pack (or renamed to
+    objects/<sha> when no pack is given); duplicate content just
+    discards it. Returns the hex sha."""
+    fd, tmp = tempfile.mkstemp(dir=objects_path, prefix="tmp-")
+    try:
+        h = _new_hash()
+        with open(path, "rb", buffering=0) as src, os.fdopen(fd, "wb") as dst:
+            buf = bytearray(BUF)
+            view = memoryview(buf)
+            while True:
+                n = src.readinto(buf)
+                if not n:
+                    break
+                h.update(view[:n])
+                dst.write(view[:n])
+        sha = h.hexdigest()
+        if pack is not None:
+            pack.append_file(sha, tmp)
+            os.unlink(tmp)
+        else:
+            obj_path = os.path.join(objects_path, sha)
+            if os.path.exists(obj_path):
+                os.unlink(tmp)
+            else:
+                os.rename(tmp, obj_path)
+        return sha
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+def hash_files(paths, hasher=file_sha1):
+    """Hash several files concurrently, returning {path: sha}.
+
+    hashlib releases the GIL inside update(), so a thread pool overlaps
+    disk reads and hashing across cores."""
+    paths = list(paths)
+    if len(paths) <= 1:
+        return {p: hasher(p) for p in paths}
+    workers = min(32, (os.cpu_count() or 1) * 2)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return dict(zip(paths, ex.map(hasher, paths)))
+
+def stat_entry(sha, st):
+    """Build an index entry carrying the hash plus the stat fields used
+    to detect change without rehashing (git-style stat cache)."""
+    return {"sha": sha, "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns, "ino": st.st_ino}
+
+def entry_sha(entry):
+    """Hash stored in an index entry (tolerates the old plain-sha format)."""
+    if isinstance(entry, dict):
+        return entry["sha"]
+    return entry
+
+def entry_matches(entry, st):
+    """True if a cached index entry is still valid for this stat result."""
+    return (isinstance(entry, dict)
+            and entry.get("size") == st.st_size
+            and entry.get("mtime_ns") == st.st_mtime_ns
+            and entry.get("ino") == st.st_ino)
+
+def tree_hash(paths, shas):
+    """Hash of a commit's file snapshot, independent of the commit
+    metadata; equal trees let consecutive commits share one copy."""
+    h = _new_hash()
+    for path, sha in zip(paths, shas):
+        h.update(path.encode())
+        h.update(b"\0")
+        h.update(sha.encode())
+        h.update(b"\n")
     return h.hexdigest()
 
-def write_json(path, data):
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+def pack_record(data, presorted=False):
+    """Serialize a record (index, commit) to bytes.
+
+    With presorted=True the caller guarantees mapping keys are already
+    in sorted order, so the serializer-side key sort (O(n log n) per
+    mapping) is skipped while the bytes stay canonical."""
+    if cbor2 is not None:
+        # Canonical CBOR is deterministic regardless of key order.
+        return cbor2.dumps(data, canonical=True)
+    if msgpack is not None:
+        return msgpack.packb(data, use_bin_type=True)
+    if orjson is not None:
+        return orjson.dumps(data, option=0 if presorted else orjson.OPT_SORT_KEYS)
+    return json.dumps(data, sort_keys=not presorted).encode()
+
+def unpack_record(buf):
+    """Deserialize bytes written by pack_record.
+
+    JSON is detected by its first byte so repos written before the
+    binary format (or without msgpack installed) still load."""
+    if buf[:1] in (b"{", b"["):
+        if orjson is not None:
+            return orjson.loads(buf)
+        return json.loads(buf)
+    if cbor2 is not None:
+        try:
+            return cbor2.loads(buf)
+        except Exception:
+            pass  # written by a msgpack-only install
+    if msgpack is not None:
+        try:
+            return msgpack.unpackb(buf, raw=False)
+        except Exception:
+            pass  # written by a cbor2 install
+    raise ValueError(
+        "unreadable record: reading this repository requires the "
+        "cbor2 (or msgpack) package")
+
+def write_record(path, data):
+    # One write() straight from the serialized bytes; going through a
+    # BufferedWriter would just add a copy and an extra allocation.
+    buf = pack_record(data)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, buf)
+    finally:
+        os.close(fd)
 
-def read_json(path):
-    with open(path) as f:
-        return json.load(f)
+def read_record(path):
+    # buffering=0 skips the BufferedReader layer; FileIO.readall pulls
+    # the whole file in with as few syscalls as possible.
+    with open(path, "rb", buffering=0) as f:
+        return unpack_record(f.read())
+
+# Sentinel for "not loaded yet" caches whose loaded value may be None
+_UNSET = object()
 
 def ensure_repo():
     if not os.path.exists(".myvcs"):
@@ -40,6 +267,71 @@ def ensure_repo():
 
 # ----------- Core Classes ------------
 
+class Pack:
+    """Append-only pack: one data file plus a {key: [offset, length]}
+    index record.
+
+    Packing many small objects/commits into one file avoids the per-file
+    open/close and directory-lookup cost of a loose file per entry, and
+    makes history reads sequential. Loose files remain a read fallback
+    for repos written by older versions."""
+
+    def __init__(self, data_path, index_path):
+        self.data_path = data_path
+        self.index_path = index_path
+        self._index = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def index(self):
+        if self._index is None:
+            if os.path.exists(self.index_path):
+                self._index = read_record(self.index_path)
+            else:
+                self._index = {}
+        return self._index
+
+    def get(self, key):
+        """Return the packed bytes for key, or None if not packed."""
+        entry = self.index().get(key)
+        if entry is None:
+            return None
+        offset, length = entry
+        with open(self.data_path, "rb") as f:
+            return os.pread(f.fileno(), length, offset)
+
+    def append_bytes(self, key, data):
+        with self._lock:
+            index = self.index()
+            if key in index:
+                return
+            with open(self.data_path, "ab") as f:
+                offset = f.tell()
+                f.write(data)
+            index[key] = [offset, len(data)]
+            self._dirty = True
+
+    def append_file(self, key, path):
+        with self._lock:
+            index = self.index()
+            if key in index:
+                return
+            with open(path, "rb", buffering=0) as src, \
+                 open(self.data_path, "ab") as dst:
+                offset = dst.tell()
+                shutil.copyfileobj(src, dst, BUF)
+                length = dst.tell() - offset
+            index[key] = [offset, length]
+            self._dirty = True
+
+    def flush(self):
+        """Persist the index if anything was appended."""
+        with self._lock:
+            if self._dirty:
+                write_record(self.index_path, self._index)
+                self._dirty = False
+
+
 class Repository:
     def __init__(self):
         ensure_repo()
@@ -48,78 +340,216 @@ class Repository:
         self.objects_path = repo_path("objects")
         self.index_path = repo_path("index")
         self.branches_path = repo_path("branches")
+        self.packed_refs_path = repo_path("packed-refs")
+        self.objects_pack = Pack(repo_path("packfile"), repo_path("packindex"))
+        self.commits_pack = Pack(repo_path("commitlog"), repo_path("commitindex"))
+        self._refs = None
+        self._index = None
+        self._current_commit = _UNSET
+        # Precomputed path prefixes: hot paths build "prefix + hash"
+        # with one concatenation instead of re-running os.path.join's
+        # separator and absolute-path checks per file.
+        self._objects_prefix = self.objects_path + os.sep
+        self._commits_prefix = self.commits_path + os.sep
+        # Deserialized commits keyed by hash; commits are immutable so
+        # entries never need invalidating within a process.
+        self._commit_cache = {}
         self.load_head()
 
     def load_head(self):
         if os.path.exists(self.head_path):
             with open(self.head_path) as f:
-                self.head = f.read().strip()
+                # An empty HEAD means detached (no branch)
+                self.head = f.read().strip() or None
         else:
             self.head = "master"
 
     def save_head(self):
+        self._current_commit = _UNSET
         with open(self.head_path, "w") as f:
-            f.write(self.head)
-
-    def get_current_commit(self):
-        branch_file = os.path.join(self.branches_path, self.head)
+            f.write(self.head or "")
+
+    def _refs_map(self):
+        """Branch refs from the packed-refs file (one read for all
+        branches); loaded lazily and cached for the process."""
+        if self._refs is None:
+            if os.path.exists(self.packed_refs_path):
+                self._refs = read_record(self.packed_refs_path)
+            else:
+                self._refs = {}
+        return self._refs
+
+    def _write_refs(self, refs):
+        tmp = self.packed_refs_path + ".tmp"
+        write_record(tmp, refs)
+        os.replace(tmp, self.packed_refs_path)
+        self._refs = refs
+
+    def resolve_branch(self, name):
+        """Commit hash a branch points at, or None. Consults packed-refs
+        first, then a loose branches/<name> file from older repos."""
+        commit_hash = self._refs_map().get(name)
+        if commit_hash is not None:
+            return commit_hash
+        branch_file = os.path.join(self.branches_path, name)
         if os.path.exists(branch_file):
             with open(branch_file) as f:
                 return f.read().strip()
         return None
 
+    def get_current_commit(self):
+        # Commit/status/checkout each ask several times per command;
+        # resolve once and reuse until HEAD or the branch moves.
+        if self._current_commit is _UNSET:
+            if self.head is None:
+                self._current_commit = None
+            else:
+                self._current_commit = self.resolve_branch(self.head)
+        return self._current_commit
+
     def update_branch(self, commit_hash):
-        branch_file = os.path.join(self.branches_path, self.head)
-        with open(branch_file, "w") as f:
-            f.write(commit_hash)
+        if self.head is None:
+            # Never let a None key reach packed-refs.
+            print("error: HEAD is detached; no branch to update.")
+            return
+        self._current_commit = commit_hash
+        refs = dict(self._refs_map())
+        refs[self.head] = commit_hash
+        self._write_refs(refs)
+        # Drop a loose ref from an older repo so it cannot go stale.
+        try:
+            os.unlink(os.path.join(self.branches_path, self.head))
+        except OSError:
+            pass
+
+    def _load_commit(self, commit_hash):
+        """Return the commit dict for a hash, or None if it does not
+        exist. Parses are cached for the lifetime of the process."""
+        commit = self._commit_cache.get(commit_hash)
+        if commit is None:
+            data = self.commits_pack.get(commit_hash)
+            if data is None:
+                # Loose commit from an older repo
+                commit_path = self._commits_prefix + commit_hash + ".json"
+                if not os.path.exists(commit_path):
+                    return None
+                commit = read_record(commit_path)
+            else:
+                commit = unpack_record(data)
+            self._commit_cache[commit_hash] = commit
+        return commit
+
+    def _has_object(self, sha):
+        return (sha in self.objects_pack.index()
+                or os.path.exists(self._objects_prefix + sha))
+
+    def _materialize(self, sha, filename):
+        """Write the object with this hash to filename."""
+        entry = self.objects_pack.index().get(sha)
+        if entry is not None:
+            offset, length = entry
+            with open(self.objects_pack.data_path, "rb") as src, \
+                 open(filename, "wb") as dst:
+                remaining = length
+                while remaining:
+                    data = os.pread(src.fileno(), min(remaining, BUF), offset)
+                    if not data:
+                        break
+                    dst.write(data)
+                    offset += len(data)
+                    remaining -= len(data)
+        else:
+            fast_copy(self._objects_prefix + sha, filename)
 
     def read_index(self):
-        if os.path.exists(self.index_path):
-            return read_json(self.index_path)
-        return {}
+        if self._index is None:
+            if os.path.exists(self.index_path):
+                self._index = read_record(self.index_path)
+            else:
+                self._index = {}
+        return self._index
 
     def write_index(self, index):
-        write_json(self.index_path, index)
+        self._index = index
+        write_record(self.index_path, index)
 
     def add(self, files):
         index = self.read_index()
+        stats = {}
+        to_hash = []
         for file in files:
-            if not os.path.exists(file):
+            try:
+                st = os.stat(file)
+            except OSError:
                 print(f"Warning: File '{file}' does not exist.")
                 continue
-            sha = file_sha1(file)
-            index[file] = sha
-            # Save file content as object
-            obj_path = os.path.join(self.objects_path, sha)
-            if not os.path.exists(obj_path):
-                shutil.copyfile(file, obj_path)
+            stats[file] = st
+            # Reuse the cached hash when size/mtime/inode are unchanged.
+            if not entry_matches(index.get(file), st):
+                to_hash.append(file)
+        # Stale files are hashed and stored in a single read pass.
+        hashed = hash_files(
+            to_hash,
+            lambda p: hash_and_store(p, self.objects_path, self.objects_pack))
+        for file, st in stats.items():
+            if file in hashed:
+                index[file] = stat_entry(hashed[file], st)
+            else:
+                # Stat-cache hit: object should exist, but repair if not.
+                if not self._has_object(index[file]["sha"]):
+                    hash_and_store(file, self.objects_path, self.objects_pack)
             print(f"Added '{file}'")
+        self.objects_pack.flush()
         self.write_index(index)
 
     def commit(self, message):
+        if self.head is None:
+            print("error: cannot commit in detached HEAD; "
+                  "create a branch first.")
+            return
         index = self.read_index()
         if not index:
             print("Nothing to commit, staging area is empty.")
             return
 
-        # Commit data structure
-        commit = {
+        # Snapshot as parallel sorted arrays: less syntax overhead than
+        # a per-entry mapping and cheaper to serialize and parse.
+        paths = sorted(index)
+        shas = [entry_sha(index[p]) for p in paths]
+        tree = tree_hash(paths, shas)
+        parent_hash = self.get_current_commit()
+        parent = self._load_commit(parent_hash) if parent_hash else None
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        fields = {
             "message": message,
-            "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
-            "files": index,
-            "parent": self.get_current_commit()
+            "parent": parent_hash,
+            "timestamp": now.isoformat().replace("+00:00", "Z"),
+            "tree": tree,
         }
-
-        # Serialize commit to json and hash it
-        commit_data = json.dumps(commit, sort_keys=True).encode()
-        commit_hash = hashlib.sha1(commit_data).hexdigest()
-
-        # Save commit
-        commit_path = os.path.join(self.commits_path, commit_hash + ".json")
-        with open(commit_path, "wb") as f:
-            f.write(commit_data)
+        if parent is not None and parent.get("tree") == tree:
+            # Identical snapshot: point at the parent's arrays instead
+            # of repeating them (structural sharing).
+            fields["tree_ref"] = parent_hash
+        else:
+            fields["paths"] = paths
+            fields["shas"] = shas
+        # Keys go in sorted order so the serialized bytes are canonical
+        # without a serializer-side sort pass.
+        commit = {k: fields[k] for k in sorted(fields)}
+
+        # Serialize commit and hash the same bytes we store
+        commit_data = pack_record(commit, presorted=True)
+        h = _new_hash()
+        h.update(commit_data)
+        commit_hash = h.hexdigest()
+
+        # Save commit to the append-only commit log
+        self.commits_pack.append_bytes(commit_hash, commit_data)
+        self.commits_pack.flush()
 
         # Update branch pointer and clear staging
+        self._commit_cache[commit_hash] = commit
         self.update_branch(commit_hash)
         self.write_index({})
         print(f"Committed to {self.head}: {commit_hash[:7]} - {message}")
@@ -130,10 +560,9 @@ class Repository:
             print("No commits yet.")
             return
         while commit_hash:
-            commit_path = os.path.join(self.commits_path, commit_hash + ".json")
-            if not os.path.exists(commit_path):
+            commit = self._load_commit(commit_hash)
+            if commit is None:
                 break
-            commit = read_json(commit_path)
             print(f"commit {commit_hash}")
             print(f"Date: {commit['timestamp']}")
             print(f"\n    {commit['message']}\n")
@@ -150,36 +579,113 @@ class Repository:
         current_commit_hash = self.get_current_commit()
         last_files = {}
         if current_commit_hash:
-            commit_path = os.path.join(self.commits_path, current_commit_hash + ".json")
-            last_commit = read_json(commit_path)
-            last_files = last_commit["files"]
+            last_commit = self._load_commit(current_commit_hash)
+            if last_commit:
+                last_files = self._commit_files(last_commit)
 
         print("Changes since last commit:")
         changed = False
-        for f in os.listdir("."):
-            if os.path.isfile(f) and not f.startswith(".myvcs"):
-                sha = file_sha1(f)
-                last_sha = last_files.get(f)
-                if sha != last_sha:
-                    print(f"  modified: {f}")
-                    changed = True
+        names = []
+        shas = {}
+        to_hash = []
+
+        def classify(rel, st):
+            names.append(rel)
+            cached = index.get(rel)
+            if entry_matches(cached, st):
+                shas[rel] = cached["sha"]
+            elif rel not in last_files:
+                # Not in the last commit: differs by definition,
+                # no need to hash it to find that out.
+                shas[rel] = None
+            else:
+                to_hash.append(rel)
+
+        watched = self._watched_changes()
+        if watched is not None:
+            # A live watcher journaled every change, so only the listed
+            # paths can differ: O(changed files) instead of O(tree).
+            for rel in sorted(watched):
+                try:
+                    st = os.stat(rel, follow_symlinks=False)
+                except OSError:
+                    continue  # deleted since the event
+                if stat_module.S_ISREG(st.st_mode):
+                    classify(rel, st)
+        else:
+            # fwalk recurses into subdirectories (listdir missed them
+            # entirely) and hands us a directory fd, so each stat
+            # resolves one name instead of the whole path. Attribute
+            # lookups are hoisted out of the per-file loop.
+            os_stat = os.stat
+            is_reg = stat_module.S_ISREG
+            for dirpath, dirnames, filenames, dirfd in os.fwalk("."):
+                if ".myvcs" in dirnames:
+                    dirnames.remove(".myvcs")
+                prefix = "" if dirpath == "." else dirpath[2:] + os.sep
+                for name in filenames:
+                    if not prefix and name.startswith(".myvcs"):
+                        continue
+                    try:
+                        st = os_stat(name, dir_fd=dirfd, follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if not is_reg(st.st_mode):
+                        continue
+                    classify(prefix + name, st)
+        shas.update(hash_files(to_hash))
+        for f in names:
+            sha = shas[f]
+            if sha is None or sha != last_files.get(f):
+                print(f"  modified: {f}")
+                changed = True
         if not changed:
             print("  no changes")
 
+    def _commit_files(self, commit):
+        """Rebuild the {path: sha} map for a commit, following tree_ref
+        links and tolerating the old inline files mapping."""
+        seen = set()
+        while commit is not None and "tree_ref" in commit:
+            ref = commit["tree_ref"]
+            if ref in seen:
+                return {}
+            seen.add(ref)
+            commit = self._load_commit(ref)
+        if commit is None:
+            return {}
+        if "files" in commit:
+            return commit["files"]
+        return dict(zip(commit["paths"], commit["shas"]))
+
+    def _watched_changes(self):
+        """Paths journaled by a live `watch` process, or None when the
+        journal cannot be trusted (no watcher running).
+
+        The journal only covers changes made while the watcher was
+        running; start it right after a commit or full status."""
+        pid_path = repo_path("fswatch.pid")
+        log_path = repo_path("fswatch.log")
+        if not (os.path.exists(pid_path) and os.path.exists(log_path)):
+            return None
+        try:
+            pid = int(open(pid_path).read())
+            os.kill(pid, 0)
+        except (ValueError, OSError):
+            return None
+        with open(log_path) as f:
+            return {line.strip() for line in f if line.strip()}
+
     def checkout(self, target):
         # Target can be a commit hash or branch name
-        commit_hash = None
-        branch_path = os.path.join(self.branches_path, target)
-        if os.path.exists(branch_path):
-            with open(branch_path) as f:
-                commit_hash = f.read().strip()
+        commit_hash = self.resolve_branch(target)
+        if commit_hash is not None:
             self.head = target
             self.save_head()
             print(f"Switched to branch '{target}'")
         else:
             # Try commit hash directly
-            commit_path = os.path.join(self.commits_path, target + ".json")
-            if os.path.exists(commit_path):
+            if self._load_commit(target) is not None:
                 commit_hash = target
                 print(f"Checked out commit {target[:7]} (detached HEAD)")
                 self.head = None
@@ -192,29 +698,71 @@ class Repository:
             print("error: commit not found")
             return
 
-        commit_path = os.path.join(self.commits_path, commit_hash + ".json")
-        commit = read_json(commit_path)
-        files = commit["files"]
-
-        # Overwrite files with committed versions
-        for filename, sha in files.items():
-            obj_path = os.path.join(self.objects_path, sha)
-            shutil.copyfile(obj_path, filename)
+        commit = self._load_commit(commit_hash)
+        if commit is None:
+            print("error: commit not found")
+            return
+        files = self._commit_files(commit)
+
+        # Overwrite files with committed versions. Materialization is
+        # independent per file and mostly kernel-side copying, so a
+        # small thread pool overlaps the open/copy/close cycles.
+        dirs = {os.path.dirname(f) for f in files}
+        for d in dirs:
+            if d:
+                os.makedirs(d, exist_ok=True)
+        items = list(files.items())
+        if len(items) <= 1:
+            for filename, sha in items:
+                self._materialize(sha, filename)
+        else:
+            with ThreadPoolExecutor(max_workers=8) as ex:
+                list(ex.map(lambda item: self._materialize(item[1], item[0]),
+                            items))
         print(f"Checked out files from commit {commit_hash[:7]}")
 
     def branch(self, name):
-        branch_file = os.path.join(self.branches_path, name)
-        if os.path.exists(branch_file):
+        if self.resolve_branch(name) is not None:
             print(f"Branch '{name}' already exists.")
             return
         current_commit = self.get_current_commit()
         if not current_commit:
             print("No commits to branch from.")
             return
-        with open(branch_file, "w") as f:
-            f.write(current_commit)
+        refs = dict(self._refs_map())
+        refs[name] = current_commit
+        self._write_refs(refs)
         print(f"Created branch '{name}' at {current_commit[:7]}")
 
+    def list_branches(self):
+        branches = set(self._refs_map())
+        if os.path.isdir(self.branches_path):
+            branches.update(os.listdir(self.branches_path))
+        branches = sorted(branches)
+        current = self.head
+        print("Branches:")
+        for b in branches:
+            if b == current:
+                print(f"* {b}")
+            else:
+                print(f"  {b}")
+
+    def current_branch(self):
+        if self.head is None:
+            print("HEAD is detached (not on any branch).")
+        else:
+            print(f"Current branch: {self.head}")
+
+    def remove(self, files):
+        index = self.read_index()
+        for file in files:
+            if file in index:
+                del index[file]
+                print(f"Removed '{file}' from staging.")
+            else:
+                print(f"'{file}' is not staged.")
+        self.write_index(index)
+
 # ----------- Command line interface ------------
 
 def init():
@@ -231,7 +779,7 @@ def init():
     print("Initialized empty myvcs repository.")
 
 
-    def print_help():
+def print_help():
     print("\nmyvcs - A Simple Version Control System\n")
     print("Usage: myvcs.py <command> [<args>]\n")
     print("Available commands:")
@@ -245,83 +793,33 @@ def init():
     print("  branch <name>          Create a new branch")
     print("  list-branches          List all branches")
     print("  current-branch         Show current branch")
+    print("  daemon                 Serve commands over .myvcs/sock")
+    print("  watch                  Journal file changes for fast status")
+    print("  stop-daemon            Stop a running daemon")
     print("  help                   Show this help message\n")
 
 
-def main():
-    if len(sys.argv) < 2:
-        print_help()
-        return
-
-
-def list_branches(self):
-        branches = os.listdir(self.branches_path)
-        current = self.head
-        print("Branches:")
-        for b in branches:
-            if b == current:
-                print(f"* {b}")
-            else:
-                print(f"  {b}")
-
-    def current_branch(self):
-        if self.head is None:
-            print("HEAD is detached (not on any branch).")
-        else:
-            print(f"Current branch: {self.head}")
-
-    def remove(self, files):
-        index = self.read_index()
-        for file in files:
-            if file in index:
-                del index[file]
-                print(f"Removed '{file}' from staging.")
-            else:
-                print(f"'{file}' is not staged.")
-        self.write_index(index)
-#qwwee
-
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: myvcs.py <command> [<args>]")
-        print("Commands: init, add, commit, log, status, checkout, branch")
-
-
-
-return
-
-    cmd = sys.argv[1]
-
-    if cmd == "init":
-        init()
-        return
-
-    if cmd == "help":
-        print_help()
-        return
-
-    try:
-        repo = Repository()
-    except SystemExit:
-        return
+def run_command(repo, args):
+    """Dispatch one repo command; args is argv without the script name."""
+    cmd = args[0]
 
     if cmd == "add":
-        if len(sys.argv) < 3:
+        if len(args) < 2:
             print("Usage: myvcs.py add <file1> [file2 ...]")
             return
-        repo.add(sys.argv[2:])
+        repo.add(args[1:])
 
     elif cmd == "remove":
-        if len(sys.argv) < 3:
+        if len(args) < 2:
             print("Usage: myvcs.py remove <file1> [file2 ...]")
             return
-        repo.remove(sys.argv[2:])
+        repo.remove(args[1:])
 
     elif cmd == "commit":
-        if len(sys.argv) < 3:
+        if len(args) < 2:
             print("Usage: myvcs.py commit <message>")
             return
-        message = " ".join(sys.argv[2:])
+        message = " ".join(args[1:])
         repo.commit(message)
 
     elif cmd == "log":
@@ -331,23 +829,186 @@ return
         repo.status()
 
     elif cmd == "checkout":
-        if len(sys.argv) < 3:
+        if len(args) < 2:
             print("Usage: myvcs.py checkout <branch_or_commit>")
             return
-        repo.checkout(sys.argv[2])
+        repo.checkout(args[1])
 
     elif cmd == "branch":
-        if len(sys.argv) < 3:
+        if len(args) < 2:
             print("Usage: myvcs.py branch <branch_name>")
             return
-        repo.branch(sys.argv[2])
+        repo.branch(args[1])
 
     elif cmd == "list-branches":
-OBOBOB        repo.list_branches()
+        repo.list_branches()
 
     elif cmd == "current-branch":
-OB        repo.current_branch()
+        repo.current_branch()
 
-OB    else:
+    else:
         print(f"Unknown command: {cmd}")
-        print("Run myvcs.py help for a list of commands."):
+        print("Run myvcs.py help for a list of commands.")
+
+
+def run_daemon():
+    """Serve commands over a Unix socket with a warm Repository.
+
+    Scripted workloads that invoke myvcs.py per command pay interpreter
+    startup plus repo loading every time; the daemon keeps the commit
+    cache, pack indexes, and loaded state alive across commands."""
+    ensure_repo()
+    sock_path = repo_path("sock")
+    try:
+        os.unlink(sock_path)
+    except OSError:
+        pass
+    repo = Repository()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(sock_path)
+        server.listen()
+        print(f"myvcs daemon listening on {sock_path}")
+        try:
+            while True:
+                conn, _ = server.accept()
+                with conn:
+                    chunks = []
+                    while True:
+                        data = conn.recv(65536)
+                        if not data:
+                            break
+                        chunks.append(data)
+                    try:
+                        args = json.loads(b"".join(chunks))
+                    except ValueError:
+                        continue
+                    out = io.StringIO()
+                    try:
+                        with contextlib.redirect_stdout(out):
+                            if args and args[0] != "stop-daemon":
+                                run_command(repo, args)
+                    except SystemExit:
+                        pass
+                    conn.sendall(out.getvalue().encode())
+                if args and args[0] == "stop-daemon":
+                    break
+        finally:
+            try:
+                os.unlink(sock_path)
+            except OSError:
+                pass
+
+
+def run_watch():
+    """Journal working-tree changes to .myvcs/fswatch.log via inotify.
+
+    While this runs, status consults the journal instead of walking the
+    whole tree, making it O(changed files). The journal starts empty,
+    so begin watching right after a commit or full status."""
+    ensure_repo()
+    if inotify_simple is None:
+        print("The watch command requires the inotify_simple package (Linux).")
+        return
+    flags = inotify_simple.flags
+    mask = (flags.CREATE | flags.MODIFY | flags.CLOSE_WRITE
+            | flags.MOVED_TO | flags.MOVED_FROM | flags.DELETE)
+    ino = inotify_simple.INotify()
+    watches = {}
+
+    def watch_tree(root):
+        for dirpath, dirnames, _ in os.walk(root):
+            if ".myvcs" in dirnames:
+                dirnames.remove(".myvcs")
+            wd = ino.add_watch(dirpath, mask)
+            watches[wd] = dirpath
+
+    watch_tree(".")
+    with open(repo_path("fswatch.pid"), "w") as f:
+        f.write(str(os.getpid()))
+    print("Watching for changes (Ctrl-C to stop)...")
+    try:
+        with open(repo_path("fswatch.log"), "a", buffering=1) as log:
+            while True:
+                for event in ino.read():
+                    if not event.name:
+                        continue
+                    dirpath = watches.get(event.wd, ".")
+                    rel = os.path.normpath(os.path.join(dirpath, event.name))
+                    if rel.split(os.sep, 1)[0] == ".myvcs":
+                        continue
+                    log.write(rel + "\n")
+                    if event.mask & flags.CREATE and os.path.isdir(rel):
+                        watch_tree(rel)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # A stale journal would make status lie, so drop it on exit.
+        for p in (repo_path("fswatch.pid"), repo_path("fswatch.log")):
+            try:
+                os.unlink(p)
+            except OSError:
+                pass
+
+
+def forward_to_daemon(args):
+    """Send args to a running daemon; returns True if it handled them."""
+    sock_path = repo_path("sock")
+    if not os.path.exists(sock_path):
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.connect(sock_path)
+            conn.sendall(json.dumps(args).encode())
+            conn.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    break
+                chunks.append(data)
+    except OSError:
+        return False  # stale socket; run locally
+    sys.stdout.write(b"".join(chunks).decode())
+    return True
+
+
+def main():
+    if len(sys.argv) < 2:
+        print_help()
+        return
+
+    cmd = sys.argv[1]
+
+    if cmd == "init":
+        init()
+        return
+
+    if cmd == "help":
+        print_help()
+        return
+
+    if cmd == "daemon":
+        run_daemon()
+        return
+
+    if cmd == "watch":
+        run_watch()
+        return
+
+    # A running daemon has everything warm; hand the command to it.
+    if os.path.exists(".myvcs") and forward_to_daemon(sys.argv[1:]):
+        return
+    if cmd == "stop-daemon":
+        print("No daemon running.")
+        return
+
+    try:
+        repo = Repository()
+    except SystemExit:
+        return
+
+    run_command(repo, sys.argv[1:])
+
+
+if __name__ == "__main__":
+    main()